@@ -0,0 +1,199 @@
+# batch_sim.py
+# Vectorized version of RacingEnv that steps many cars at once with numpy.
+# The track is rasterized once into a boolean road mask, so rays, collisions
+# and checkpoints become array lookups instead of per-pixel surface.get_at calls.
+import numpy as np
+from track_mask import footprint_offsets, footprint_on_road, points_on_road
+from tracks import VARIANTS, track_artifacts
+
+
+def _ccw(ax, ay, bx, by, cx, cy):
+    return (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
+
+
+def segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+    """Same test as Car.check_checkpoint, broadcast over arrays."""
+    return ((_ccw(ax, ay, cx, cy, dx, dy) != _ccw(bx, by, cx, cy, dx, dy)) &
+            (_ccw(ax, ay, bx, by, cx, cy) != _ccw(ax, ay, bx, by, dx, dy)))
+
+
+class BatchRacingSim:
+    """N independent copies of RacingEnv's dynamics and reward, auto-reset on done."""
+
+    def __init__(self, num_cars, track="default",
+                 max_speed=5.0, acceleration=0.1, turn_speed=4.0,
+                 ray_length=150, num_rays=9, fov=150, max_steps=1500, collision="footprint"):
+        if collision not in ("footprint", "center"):
+            raise ValueError(f"unknown collision mode {collision!r}")
+        self.num_cars = num_cars
+        self.track = track
+        self.mask = track_artifacts(track)["mask"]
+        self.collision = collision
+        self.footprint = footprint_offsets()
+        self.height, self.width = self.mask.shape
+        self.checkpoints = np.array(VARIANTS[track].checkpoints, dtype=np.float64).reshape(-1, 4)
+        self.start = VARIANTS[track].start
+
+        self.max_speed = max_speed
+        self.acceleration = acceleration
+        self.turn_speed = turn_speed
+        self.ray_length = ray_length
+        self.ray_offsets = -fov / 2 + np.arange(num_rays) * (fov / (num_rays - 1))
+        self.max_steps = max_steps
+
+        self.x = np.zeros(num_cars)
+        self.y = np.zeros(num_cars)
+        self.angle = np.zeros(num_cars)
+        self.speed = np.zeros(num_cars)
+        self.crashed = np.zeros(num_cars, dtype=bool)
+        self.checkpoint_index = np.zeros(num_cars, dtype=np.int64)
+        self.prev_checkpoint = np.zeros(num_cars, dtype=np.int64)
+        self.laps = np.zeros(num_cars, dtype=np.int64)  # Car.laps, counted on every wrap
+        self.steps = np.zeros(num_cars, dtype=np.int64)
+        self.sensor_distances = np.zeros((num_cars, num_rays))
+
+    @property
+    def obs_dim(self):
+        return len(self.ray_offsets) + 1
+
+    def reset(self, idx=None):
+        if idx is None:
+            idx = np.arange(self.num_cars)
+        self.x[idx], self.y[idx], self.angle[idx] = self.start
+        self.speed[idx] = 0.0
+        self.crashed[idx] = False
+        self.checkpoint_index[idx] = 0
+        self.prev_checkpoint[idx] = 0
+        self.laps[idx] = 0
+        self.steps[idx] = 0
+        return self.get_obs(idx)
+
+    def on_road(self):
+        if self.collision == "center":
+            return points_on_road(self.mask, self.x, self.y)  # Car.check_collision's lookup
+        return footprint_on_road(self.mask, self.x, self.y, self.angle, self.footprint)
+
+    def cast_rays(self, idx=slice(None)):
+        # (N, rays, length) sample grid, same truncation and early exit as Car.cast_single_ray
+        rad = np.radians(-(self.angle[idx, None] + self.ray_offsets[None, :]))
+        lengths = np.arange(self.ray_length, dtype=np.float64)
+        tx = (self.x[idx, None, None] + lengths * np.cos(rad)[..., None]).astype(np.int32)
+        ty = (self.y[idx, None, None] + lengths * np.sin(rad)[..., None]).astype(np.int32)
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        road = self.mask[np.clip(ty, 0, self.height - 1), np.clip(tx, 0, self.width - 1)]
+
+        stop = ~inside | ~road
+        first = stop.argmax(axis=2)
+        hit_wall = np.take_along_axis(inside, first[..., None], axis=2)[..., 0] & stop.any(axis=2)
+        self.sensor_distances[idx] = np.where(hit_wall, first, self.ray_length)
+        return self.sensor_distances[idx]
+
+    def get_obs(self, idx=slice(None)):
+        sensors = np.minimum(self.cast_rays(idx) / self.ray_length, 1.0)
+        speed = (self.speed[idx] / self.max_speed)[:, None]
+        return np.concatenate([sensors, speed], axis=1).astype(np.float32)
+
+    def _check_checkpoints(self):
+        active = ~self.crashed & (self.checkpoint_index < len(self.checkpoints))
+        seg = self.checkpoints[np.minimum(self.checkpoint_index, len(self.checkpoints) - 1)]
+        rad = np.radians(-self.angle)
+        prev_x = self.x - self.speed * np.cos(rad)
+        prev_y = self.y - self.speed * np.sin(rad)
+        passed = active & segments_intersect(seg[:, 0], seg[:, 1], seg[:, 2], seg[:, 3],
+                                             prev_x, prev_y, self.x, self.y)
+        self.checkpoint_index[passed] += 1
+        lap = passed & (self.checkpoint_index >= len(self.checkpoints))
+        self.laps[lap] += 1
+        self.checkpoint_index[lap] = 0
+        return lap
+
+    def step(self, actions):
+        """Apply one discrete action per car.
+
+        Returns (next_obs, rewards, terminated, truncated, obs, lap_done): next_obs is the
+        observation each car actually reached (terminal obs for finished cars) and obs is
+        what to act on next, with finished cars already reset.
+        """
+        actions = np.asarray(actions)
+        self.steps += 1
+        was_crashed = self.crashed.copy()
+        live = ~was_crashed
+
+        accel = live & (actions == 1)
+        brake = live & (actions == 2)
+        self.speed[accel] = np.minimum(self.speed[accel] + self.acceleration, self.max_speed)
+        self.speed[brake] = np.maximum(self.speed[brake] - self.acceleration, -self.max_speed / 2)
+        turn = self.turn_speed * (self.speed / self.max_speed)
+        self.angle += np.where(live & (actions == 3), turn, 0.0)
+        self.angle -= np.where(live & (actions == 4), turn, 0.0)
+
+        rad = np.radians(-self.angle)
+        self.x += np.where(live, self.speed * np.cos(rad), 0.0)
+        self.y += np.where(live, self.speed * np.sin(rad), 0.0)
+
+        self.crashed |= live & ~self.on_road()
+        lap_done = self._check_checkpoints() & live
+
+        # Reward mirrors RacingEnv.step
+        rewards = np.full(self.num_cars, -0.01)
+        progressed = live & (self.checkpoint_index > self.prev_checkpoint)
+        rewards[progressed] += 1.0
+        self.prev_checkpoint[progressed] = self.checkpoint_index[progressed]
+        rewards[lap_done] += 20.0
+        self.prev_checkpoint[lap_done] = 0
+        rewards[was_crashed] = -10.0
+
+        terminated = self.crashed | lap_done
+        truncated = self.steps >= self.max_steps  # Same as RacingEnv: can coincide with terminated
+
+        next_obs = self.get_obs()
+        done = terminated | truncated
+        obs = next_obs
+        if done.any():
+            obs = next_obs.copy()
+            obs[done] = self.reset(np.flatnonzero(done))
+        return next_obs, rewards.astype(np.float32), terminated, truncated, obs, lap_done
+
+
+def check_parity(steps=3000, track="default", epsilon=0.2, seed=0):
+    """Drive RacingEnv and a 1-car BatchRacingSim with the same actions and compare every step.
+
+    Actions come from demo_driver's heuristic with some seeded random ones mixed in, so
+    the run covers laps, crashes and resets. Raises AssertionError at the first step
+    where obs, reward, terminated or truncated differ; returns (steps, laps, crashes).
+    """
+    from racing_env import RacingEnv
+    from demo_driver import heuristic_actions
+
+    rng = np.random.default_rng(seed)
+    env = RacingEnv(track=track)
+    sim = BatchRacingSim(1, track=track)
+    obs, _ = env.reset()
+    sim_obs = sim.reset()
+    laps = crashes = 0
+    for t in range(steps):
+        assert np.allclose(obs, sim_obs[0], atol=1e-6), f"step {t}: obs {obs} != {sim_obs[0]}"
+        action = int(heuristic_actions(obs[None], ray_length=env.ray_length)[0])
+        if rng.random() < epsilon:
+            action = int(rng.integers(5))
+
+        obs, reward, terminated, truncated, info = env.step(action)
+        next_obs, rewards, sim_term, sim_trunc, sim_obs, lap_done = sim.step([action])
+        assert np.allclose(obs, next_obs[0], atol=1e-6), f"step {t}: next obs {obs} != {next_obs[0]}"
+        assert np.isclose(reward, rewards[0]), f"step {t}: reward {reward} != {rewards[0]}"
+        assert (terminated, truncated) == (sim_term[0], sim_trunc[0]), \
+            f"step {t}: done {(terminated, truncated)} != {(sim_term[0], sim_trunc[0])}"
+        if terminated or truncated:
+            laps += info["laps"]
+            crashes += info["crashed"]
+            obs, _ = env.reset()
+    return steps, laps, crashes
+
+
+if __name__ == "__main__":
+    from tracks import VARIANTS
+
+    # Parity check: BatchRacingSim must stay step-for-step identical to RacingEnv
+    for name in VARIANTS:
+        steps, laps, crashes = check_parity(track=name)
+        print(f"✅ {name}: {steps} steps match RacingEnv | laps: {laps} | crashes: {crashes}")
@@ -2,13 +2,9 @@ import pygame
 import sys
 import math
 
-# Initialize Pygame
-pygame.init()
-
-# Screen settings
+# Screen settings (the window itself is only opened in main(), so importing
+# Car / draw_track for headless training doesn't pop up a display)
 WIDTH, HEIGHT = 800, 600
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Self-Driving Car with Aligned Checkpoints")
 
 # Colors
 WHITE = (255, 255, 255)
@@ -21,7 +17,6 @@ CYAN = (0, 255, 255)
 
 # FPS
 FPS = 60
-clock = pygame.time.Clock()
 
 # ✅ Updated, aligned checkpoints
 checkpoints = [
@@ -37,16 +32,32 @@ checkpoints = [
     ((420, 150), (470, 190))    # Finish approach
 ]
 
+# Track outline, drawn by draw_track (tracks.py builds mirrored variants from these)
+OUTER = [
+    (400, 150), (500, 130), (600, 120), (700, 140),
+    (750, 200), (780, 300), (750, 400), (700, 460),
+    (600, 480), (500, 470), (400, 450), (320, 400),
+    (300, 300), (320, 200)
+]
+
+INNER = [
+    (450, 200), (530, 185), (610, 180), (680, 190),
+    (710, 240), (730, 300), (710, 370), (680, 420),
+    (600, 430), (520, 420), (440, 400), (380, 360),
+    (370, 300), (380, 240)
+]
+
 def is_similar_color(c1, c2, tolerance=30):
     return all(abs(a - b) <= tolerance for a, b in zip(c1, c2))
 
 class Car:
-    def __init__(self, x, y):
+    def __init__(self, x, y, angle=-10):
         self.init_x = x
         self.init_y = y
+        self.init_angle = angle
         self.x = x
         self.y = y
-        self.angle = -10
+        self.angle = angle
         self.speed = 0
         self.max_speed = 5
         self.acceleration = 0.1
@@ -67,7 +78,7 @@ class Car:
     def reset(self):
         self.x = self.init_x
         self.y = self.init_y
-        self.angle = -10
+        self.angle = self.init_angle
         self.speed = 0
         self.crashed = False
         self.checkpoint_index = 0
@@ -180,27 +191,12 @@ class Car:
 
             if self.checkpoint_index >= len(checkpoints):
                 self.laps += 1
-                print(f"🎉 Lap {self.laps} completed!")
                 self.checkpoint_index = 0
 
 
-def draw_track(surface):
+def draw_track(surface, outer=OUTER, inner=INNER):
     surface.fill(GREEN)
 
-    outer = [
-        (400, 150), (500, 130), (600, 120), (700, 140),
-        (750, 200), (780, 300), (750, 400), (700, 460),
-        (600, 480), (500, 470), (400, 450), (320, 400),
-        (300, 300), (320, 200)
-    ]
-
-    inner = [
-        (450, 200), (530, 185), (610, 180), (680, 190),
-        (710, 240), (730, 300), (710, 370), (680, 420),
-        (600, 430), (520, 420), (440, 400), (380, 360),
-        (370, 300), (380, 240)
-    ]
-
     pygame.draw.polygon(surface, GRAY, outer)
     pygame.draw.polygon(surface, GREEN, inner)
     pygame.draw.lines(surface, WHITE, True, outer, 2)
@@ -209,6 +205,11 @@ def draw_track(surface):
 
 
 def main():
+    pygame.init()
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Self-Driving Car with Aligned Checkpoints")
+    clock = pygame.time.Clock()
+
     car = Car(420, 160)
     run = True
 
@@ -224,7 +225,10 @@ def main():
         car.cast_rays(WIN)
         car.ai_control()
         car.check_collision(WIN)
+        laps_before = car.laps
         car.check_checkpoint(checkpoints)
+        if car.laps > laps_before:
+            print(f"🎉 Lap {car.laps} completed!")
         car.draw(WIN)
         car.draw_rays(WIN)
 
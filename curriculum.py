@@ -0,0 +1,174 @@
+# curriculum.py
+# Curriculum training across track variants (tracks.py) and difficulty settings.
+# The scheduler watches the rolling lap-completion rate of finished training episodes
+# and moves to the next stage once it clears a threshold; the callback pushes the new
+# stage into every env with set_stage(), which takes effect at that env's next reset;
+# each episode reports its stage in info["stage"], and only current-stage episodes count.
+#
+#   python curriculum.py --timesteps 300000 --envs 4
+# trains once with the curriculum and once on the single default track, and reports
+# time-to-first-lap for both.
+import argparse
+import os
+import time
+from collections import deque
+from functools import partial
+from stable_baselines3.common.callbacks import BaseCallback
+from racing_env import RacingEnv
+from tracks import track_artifacts
+
+# Easier stages drive slower, turn sharper and see further; the last stage is RacingEnv's defaults
+STAGES = [
+    {"name": "learner", "tracks": ["default"],
+     "max_speed": 3.0, "turn_speed": 5.0, "ray_length": 200, "max_steps": 2500},
+    {"name": "mirrored", "tracks": ["default", "mirror_x"],
+     "max_speed": 4.0, "turn_speed": 4.5, "ray_length": 175, "max_steps": 2000},
+    {"name": "full", "tracks": ["default", "mirror_x", "mirror_y", "rotate_180"],
+     "max_speed": 5.0, "turn_speed": 4.0, "ray_length": 150, "max_steps": 1500},
+]
+
+
+class CurriculumScheduler:
+    def __init__(self, stages=STAGES, window=50, promote_at=0.3, min_episodes=20):
+        self.stages = stages
+        self.window = window
+        self.promote_at = promote_at
+        self.min_episodes = min_episodes
+        self.stage = 0
+        self.outcomes = deque(maxlen=window)
+        self.history = []  # (timestep, stage index) for every promotion
+
+        # Build every variant's cached artifacts now, before any worker process asks for them
+        for name in {t for s in stages for t in s["tracks"]}:
+            track_artifacts(name)
+
+    @property
+    def current(self):
+        return self.stages[self.stage]
+
+    @property
+    def lap_rate(self):
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def env_stage(self, env_index):
+        """set_stage() kwargs for one env; envs are spread round-robin over the stage's tracks."""
+        stage = self.current
+        params = {k: v for k, v in stage.items() if k not in ("name", "tracks")}
+        return {"stage": self.stage, "track": stage["tracks"][env_index % len(stage["tracks"])], **params}
+
+    def record(self, lap_completed, timestep=None):
+        """Add one finished episode; returns True if this promoted the curriculum."""
+        self.outcomes.append(bool(lap_completed))
+        if (self.stage < len(self.stages) - 1 and len(self.outcomes) >= self.min_episodes
+                and self.lap_rate >= self.promote_at):
+            self.stage += 1
+            self.outcomes.clear()
+            self.history.append((timestep, self.stage))
+            return True
+        return False
+
+    def make_env(self, env_index=0):
+        """Env factory for the current stage, for building the VecEnv up front."""
+        return partial(RacingEnv, **self.env_stage(env_index))
+
+
+class CurriculumCallback(BaseCallback):
+    def __init__(self, scheduler, verbose=1):
+        super().__init__(verbose)
+        self.scheduler = scheduler
+
+    def _push_stage(self):
+        for i in range(self.training_env.num_envs):
+            self.training_env.env_method("set_stage", indices=[i], **self.scheduler.env_stage(i))
+
+    def _on_training_start(self):
+        self._push_stage()
+
+    def _on_step(self):
+        for done, info in zip(self.locals["dones"], self.locals["infos"]):
+            # set_stage() only applies at each env's next reset, so episodes still running
+            # on the previous stage finish after a promotion; they don't count toward this one
+            if not done or info.get("stage", self.scheduler.stage) != self.scheduler.stage:
+                continue
+            if self.scheduler.record(info.get("laps", 0) > 0, self.num_timesteps):
+                self._push_stage()
+                if self.verbose:
+                    print(f"📈 Curriculum stage {self.scheduler.stage}: {self.scheduler.current['name']} "
+                          f"at step {self.num_timesteps:,}")
+        self.logger.record("curriculum/stage", self.scheduler.stage)
+        self.logger.record("curriculum/lap_rate", self.scheduler.lap_rate)
+        return True
+
+
+class FirstLapCallback(BaseCallback):
+    """Remembers the timestep and wall-clock time of the first completed training lap."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_lap_step = None
+        self.first_lap_seconds = None
+
+    def _on_training_start(self):
+        self.start = time.perf_counter()
+
+    def _on_step(self):
+        if self.first_lap_step is None and any(info.get("laps", 0) > 0 for info in self.locals["infos"]):
+            self.first_lap_step = self.num_timesteps
+            self.first_lap_seconds = time.perf_counter() - self.start
+            print(f"🏁 First lap at step {self.first_lap_step:,} ({self.first_lap_seconds:.0f}s)")
+        return True
+
+
+def training_kwargs(scheduler=None):
+    """Extra train_racer.train() arguments that turn on the curriculum.
+
+    Turns off the demo warm-start: demo_driver records at RacingEnv's default ray_length
+    and max_speed, so its observations are on a different scale from the early stages.
+    """
+    scheduler = scheduler or CurriculumScheduler()
+    return {"env_fn": scheduler.make_env(), "callbacks": [CurriculumCallback(scheduler)], "demo_dir": None}
+
+
+def compare(total_timesteps=300_000, n_envs=4, out_dir="./runs/curriculum_compare", seed=0, subproc=False):
+    """Train with and without the curriculum and report time-to-first-lap for both."""
+    from train_racer import train
+
+    results = []
+    for name in ("single_track", "curriculum"):
+        scheduler = CurriculumScheduler() if name == "curriculum" else None
+        extra = training_kwargs(scheduler) if scheduler else {"env_fn": RacingEnv, "callbacks": [], "demo_dir": None}
+        first_lap = FirstLapCallback()
+        extra["callbacks"].append(first_lap)
+
+        _, eval_callback = train(
+            model_dir=os.path.join(out_dir, name, "models"),
+            log_dir=os.path.join(out_dir, name, "logs"),
+            total_timesteps=total_timesteps,
+            resume=False,
+            seed=seed,
+            verbose=0,
+            n_envs=n_envs,
+            subproc=subproc,
+            **extra
+        )
+        results.append((name, first_lap, eval_callback.best_mean_reward,
+                        scheduler.current["name"] if scheduler else "-"))
+
+    print("\n⏱️ Time to first lap")
+    print(f"{'run':<14}{'steps':>12}{'seconds':>10}{'best eval':>12}  final stage")
+    for name, first_lap, best, stage in results:
+        steps = f"{first_lap.first_lap_step:,}" if first_lap.first_lap_step is not None else "none"
+        seconds = f"{first_lap.first_lap_seconds:.0f}" if first_lap.first_lap_seconds is not None else "-"
+        print(f"{name:<14}{steps:>12}{seconds:>10}{best:>12.2f}  {stage}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Curriculum vs single-track time-to-first-lap")
+    parser.add_argument("--timesteps", type=int, default=300_000)
+    parser.add_argument("--envs", type=int, default=4)
+    parser.add_argument("--out", default="./runs/curriculum_compare")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--subproc", action="store_true", help="run training envs in worker processes")
+    args = parser.parse_args()
+    compare(args.timesteps, args.envs, args.out, args.seed, args.subproc)
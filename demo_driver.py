@@ -0,0 +1,176 @@
+# demo_driver.py
+# Batched version of Car.ai_control that drives thousands of cars through BatchRacingSim
+# and streams (obs, action, reward, next_obs, done) to chunked .npz files.
+# The chunks can be loaded straight into a DQN replay buffer to warm-start training.
+import argparse
+import glob
+import os
+import time
+import numpy as np
+from batch_sim import BatchRacingSim
+
+# Actions, same as RacingEnv: [0: nothing, 1: accelerate, 2: brake, 3: turn left, 4: turn right]
+NOOP, ACCELERATE, BRAKE, LEFT, RIGHT = range(5)
+
+
+def heuristic_actions(obs, ray_length=150, forward_threshold=80, panic_threshold=30,
+                      steer_deadband=0.1, min_speed=0.2):
+    """Car.ai_control's decisions for a batch of RacingEnv observations, as discrete actions."""
+    d = obs[:, :9] * ray_length
+    speed = obs[:, 9]
+    L2, L1, FL, FFL, F, FFR, FR, R1, R2 = d.T
+
+    left_total = L2 + L1 + FL + FFL
+    right_total = FR + R1 + R2 + FFR
+    steer = (right_total - left_total) / 400.0
+
+    actions = np.full(len(obs), NOOP, dtype=np.int64)
+    actions[speed < 1.0] = ACCELERATE
+    actions[steer > steer_deadband] = LEFT
+    actions[steer < -steer_deadband] = RIGHT
+
+    # ai_control slows down when the front is blocked; the env can only brake
+    blocked = (F <= forward_threshold) & (speed > min_speed)
+    actions[blocked & (np.abs(steer) <= steer_deadband)] = BRAKE
+    # Turning scales with speed in the env, so a stopped car has to get moving first
+    actions[speed <= 0] = ACCELERATE
+
+    # Emergency dodge
+    panic = F < panic_threshold
+    actions[panic & (FL + FFL < FR + FFR)] = LEFT
+    actions[panic & (FL + FFL >= FR + FFR)] = RIGHT
+    return actions
+
+
+class DemoWriter:
+    """Buffers transitions in memory and writes one .npz file every chunk_size rows.
+
+    fill_replay_buffer loads every chunk in a directory, so an out_dir that already holds
+    chunks (possibly from another seed, epsilon or sim setting) is refused unless append.
+    """
+
+    def __init__(self, out_dir, chunk_size=200_000, append=False):
+        self.out_dir = out_dir
+        self.chunk_size = chunk_size
+        self.chunk_id = len(glob.glob(os.path.join(out_dir, "chunk_*.npz")))
+        if self.chunk_id and not append:
+            raise FileExistsError(f"{out_dir} already holds {self.chunk_id} demo chunks; "
+                                  f"use another directory or append=True (--append)")
+        self.rows = 0
+        self._buf = {k: [] for k in ("obs", "action", "reward", "next_obs", "done", "timeout")}
+        self._buffered = 0
+        os.makedirs(out_dir, exist_ok=True)
+
+    def add(self, obs, actions, rewards, next_obs, terminated, truncated):
+        self._buf["obs"].append(obs)
+        self._buf["action"].append(actions.astype(np.uint8))
+        self._buf["reward"].append(rewards.astype(np.float32))
+        self._buf["next_obs"].append(next_obs)
+        self._buf["done"].append(terminated | truncated)
+        self._buf["timeout"].append(truncated & ~terminated)
+        self._buffered += len(actions)
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffered == 0:
+            return
+        path = os.path.join(self.out_dir, f"chunk_{self.chunk_id:05d}.npz")
+        np.savez(path, **{k: np.concatenate(v) for k, v in self._buf.items()})
+        self.chunk_id += 1
+        self.rows += self._buffered
+        self._buf = {k: [] for k in self._buf}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+
+
+def iter_demo_chunks(demo_dir):
+    for path in sorted(glob.glob(os.path.join(demo_dir, "chunk_*.npz"))):
+        with np.load(path) as chunk:
+            yield {k: chunk[k] for k in chunk.files}
+
+
+def fill_replay_buffer(model, demo_dir, max_transitions=None):
+    """Copy demo chunks into model.replay_buffer (SB3 ReplayBuffer) with slice writes.
+
+    With n_envs > 1 consecutive demo rows are spread across the env slots of each
+    buffer position (a chunk's last len % n_envs rows are dropped). Returns the number
+    of transitions added. Raises ValueError for buffers using optimize_memory_usage,
+    which derive next_obs from the following slot.
+    """
+    rb = model.replay_buffer
+    if rb.optimize_memory_usage:
+        raise ValueError("fill_replay_buffer needs a replay buffer with optimize_memory_usage=False")
+    n_envs = rb.n_envs
+
+    added = 0
+    for chunk in iter_demo_chunks(demo_dir):
+        n = len(chunk["action"])
+        if max_transitions is not None:
+            n = min(n, max_transitions - added)
+        n -= n % n_envs
+        rows = n // n_envs
+        data = {k: v[:n].reshape(rows, n_envs, *v.shape[1:]) for k, v in chunk.items()}
+        start = 0
+        while start < rows:
+            count = min(rows - start, rb.buffer_size - rb.pos)
+            src = slice(start, start + count)
+            dst = slice(rb.pos, rb.pos + count)
+            rb.observations[dst] = data["obs"][src]
+            rb.next_observations[dst] = data["next_obs"][src]
+            rb.actions[dst, :, 0] = data["action"][src]
+            rb.rewards[dst] = data["reward"][src]
+            rb.dones[dst] = data["done"][src]
+            rb.timeouts[dst] = data["timeout"][src]
+            rb.pos += count
+            if rb.pos == rb.buffer_size:
+                rb.full = True
+                rb.pos = 0
+            start += count
+        added += n
+        if max_transitions is not None and added >= max_transitions:
+            break
+    return added
+
+
+def generate(out_dir, num_cars=2048, steps=3000, chunk_size=200_000, epsilon=0.1, seed=0, append=False):
+    """Drive num_cars heuristic cars for `steps` batched steps and write demos to out_dir."""
+    writer = DemoWriter(out_dir, chunk_size, append=append)
+    rng = np.random.default_rng(seed)
+    sim = BatchRacingSim(num_cars)
+    obs = sim.reset()
+    laps = crashes = 0
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = heuristic_actions(obs, ray_length=sim.ray_length)
+        # Epsilon noise so the buffer also covers recoveries from non-heuristic states
+        explore = rng.random(num_cars) < epsilon
+        actions[explore] = rng.integers(0, 5, size=explore.sum())
+
+        next_obs, rewards, terminated, truncated, new_obs, lap_done = sim.step(actions)
+        writer.add(obs, actions, rewards, next_obs, terminated, truncated)
+        laps += int(lap_done.sum())
+        crashes += int((terminated & ~lap_done).sum())
+        obs = new_obs
+    writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Wrote {writer.rows:,} transitions to {out_dir} in {elapsed:.1f}s "
+          f"({writer.rows / elapsed:,.0f} steps/s) | laps: {laps} | crashes: {crashes}")
+    return writer.rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate heuristic driving demonstrations")
+    parser.add_argument("--out", default="./demos")
+    parser.add_argument("--cars", type=int, default=2048)
+    parser.add_argument("--steps", type=int, default=3000)
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--append", action="store_true", help="add chunks to a non-empty --out directory")
+    args = parser.parse_args()
+    generate(args.out, args.cars, args.steps, args.chunk_size, args.epsilon, args.seed, args.append)
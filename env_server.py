@@ -0,0 +1,358 @@
+# env_server.py
+# Hosts RacingEnv instances behind a Unix socket or TCP port so trainers don't need
+# pygame or the track in-process. RemoteVecEnv is the client side and behaves like an
+# SB3 VecEnv: one STEP message carries the actions for all N envs, and the reply holds
+# the observations as one contiguous float32 buffer.
+#
+#   python env_server.py serve --address unix:/tmp/racing.sock
+#   python env_server.py bench --envs 16 --steps 2000
+#
+# Wire format: every frame is <op:u8><payload_len:u32> followed by the payload.
+#   HELLO  u32 n_envs                  -> u32 n_envs, u32 obs_dim, u32 n_actions
+#   RESET  i64[n] seeds (-1 = none)    -> f32[n*obs_dim] obs, INFO_DTYPE[n]
+#   STEP   u8[n] actions               -> f32[n*obs_dim] obs, f32[n] rewards, u8[n] terminated,
+#                                         u8[n] truncated, INFO_DTYPE[n], then for the k envs that
+#                                         finished (auto-reset like VecEnv): f32[k*obs_dim] terminal
+#                                         obs, INFO_DTYPE[k] reset infos
+#   ATTR   JSON {name, indices}        -> JSON list with the attribute of each env
+#   SETATTR JSON {name, value, indices} -> (empty)
+#   METHOD JSON {name, args, kwargs, indices} -> JSON list with each env's return value
+#   CLOSE  (empty)                     -> (empty)
+# Any request can instead get ERROR, JSON {type, message}. The control ops (ATTR, SETATTR,
+# METHOD) only carry JSON values; anything else comes back as a TypeError.
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import time
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+# pygame.init() (every RacingEnv) otherwise installs SDL's SIGTERM/SIGINT handlers for the
+# whole process, and a server that has built envs could no longer be stopped with kill,
+# timeout or a service manager. Must be set before the first env is built.
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+HELLO, RESET, STEP, ATTR, CLOSE, ERROR, SETATTR, METHOD = range(1, 9)
+HEADER = struct.Struct("<BI")
+
+# Mirrors RacingEnv._get_info
+INFO_DTYPE = np.dtype([
+    ("checkpoints", "<i2"),
+    ("laps", "<i2"),
+    ("steps", "<i4"),
+    ("speed", "<f4"),
+    ("crashed", "?"),
+    ("stage", "<i2"),
+])
+
+DEFAULT_ADDRESS = "tcp:127.0.0.1:5757"
+
+# Server-side exception types re-raised as themselves by the client (others -> RuntimeError)
+REMOTE_ERRORS = {exc.__name__: exc for exc in (AttributeError, TypeError, ValueError, IndexError, KeyError)}
+
+
+def parse_address(address):
+    """'unix:/path/to.sock' or 'tcp:host:port' (a bare 'host:port' is TCP too)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("tcp:"):
+        address = address[len("tcp:"):]
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host, int(port))
+
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        count = sock.recv_into(view[got:], n - got)
+        if count == 0:
+            raise ConnectionError("socket closed")
+        got += count
+    return buf
+
+
+def send_frame(sock, op, payload=b""):
+    sock.sendall(HEADER.pack(op, len(payload)) + payload)
+
+
+def recv_frame(sock):
+    op, size = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return op, _recv_exact(sock, size) if size else bytearray()
+
+
+def _pack_infos(infos):
+    packed = np.zeros(len(infos), dtype=INFO_DTYPE)
+    for i, info in enumerate(infos):
+        for name in INFO_DTYPE.names:
+            packed[i][name] = info[name]
+    return packed.tobytes()
+
+
+class EnvHandler(socketserver.BaseRequestHandler):
+    """Serves one client; the envs live as long as the connection."""
+
+    def handle(self):
+        from racing_env import RacingEnv
+
+        sock = self.request
+        if sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        envs = []
+        while True:
+            try:
+                op, payload = recv_frame(sock)
+            except ConnectionError:
+                return
+            try:
+                if op == HELLO:
+                    (n,) = struct.unpack("<I", payload)
+                    envs = [RacingEnv() for _ in range(n)]
+                    space = envs[0].observation_space
+                    send_frame(sock, HELLO, struct.pack("<III", n, space.shape[0], envs[0].action_space.n))
+                elif op == RESET:
+                    seeds = np.frombuffer(payload, dtype="<i8")
+                    results = [env.reset(seed=None if s < 0 else int(s)) for env, s in zip(envs, seeds)]
+                    obs = np.stack([o for o, _ in results]).astype("<f4")
+                    send_frame(sock, RESET, obs.tobytes() + _pack_infos([i for _, i in results]))
+                elif op == STEP:
+                    send_frame(sock, STEP, self._step(envs, np.frombuffer(payload, dtype=np.uint8)))
+                elif op == ATTR:
+                    request = json.loads(payload)
+                    values = [getattr(envs[i], request["name"]) for i in request["indices"]]
+                    send_frame(sock, ATTR, json.dumps(values).encode())
+                elif op == SETATTR:
+                    request = json.loads(payload)
+                    for i in request["indices"]:
+                        setattr(envs[i], request["name"], request["value"])
+                    send_frame(sock, SETATTR)
+                elif op == METHOD:
+                    request = json.loads(payload)
+                    results = [getattr(envs[i], request["name"])(*request["args"], **request["kwargs"])
+                               for i in request["indices"]]
+                    send_frame(sock, METHOD, json.dumps(results).encode())
+                elif op == CLOSE:
+                    send_frame(sock, CLOSE)
+                    return
+                else:
+                    raise ValueError(f"unknown op {op}")
+            except Exception as exc:
+                error = {"type": type(exc).__name__, "message": str(exc)}
+                send_frame(sock, ERROR, json.dumps(error).encode())
+
+    def _step(self, envs, actions):
+        n = len(envs)
+        if len(actions) != n:
+            raise ValueError(f"STEP carried {len(actions)} actions for {n} envs")
+        n_actions = envs[0].action_space.n
+        if (actions >= n_actions).any():
+            raise ValueError(f"STEP actions must be in [0, {n_actions}), got {actions.max()}")
+        obs = np.empty((n, envs[0].observation_space.shape[0]), dtype="<f4")
+        rewards = np.empty(n, dtype="<f4")
+        terminated = np.zeros(n, dtype=np.uint8)
+        truncated = np.zeros(n, dtype=np.uint8)
+        infos = []
+        terminal_obs = []
+        reset_infos = []
+        for i, (env, action) in enumerate(zip(envs, actions)):
+            o, r, term, trunc, info = env.step(int(action))
+            rewards[i] = r
+            terminated[i] = term
+            truncated[i] = trunc
+            infos.append(info)
+            if term or trunc:
+                terminal_obs.append(o)
+                o, reset_info = env.reset()
+                reset_infos.append(reset_info)
+            obs[i] = o
+        terminal = np.asarray(terminal_obs, dtype="<f4").tobytes()
+        return (obs.tobytes() + rewards.tobytes() + terminated.tobytes() + truncated.tobytes()
+                + _pack_infos(infos) + terminal + _pack_infos(reset_infos))
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(address=DEFAULT_ADDRESS):
+    family, addr = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(addr):
+            os.unlink(addr)
+        server = _ThreadingUnixServer(addr, EnvHandler)
+    else:
+        server = _ThreadingTCPServer(addr, EnvHandler)
+    print(f"🏁 Serving RacingEnv on {address}")
+    with server:
+        server.serve_forever()
+
+
+class RemoteVecEnv(VecEnv):
+    """SB3 VecEnv backed by `n_envs` RacingEnv instances on an env_server."""
+
+    def __init__(self, n_envs, address=DEFAULT_ADDRESS, connect_timeout=10.0):
+        family, addr = parse_address(address)
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            self.sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                self.sock.connect(addr)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                self.sock.close()
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        if family != socket.AF_UNIX:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        n, self.obs_dim, n_actions = struct.unpack("<III", self._request(HELLO, struct.pack("<I", n_envs)))
+        self._actions = None
+        self.closed = False
+        observation_space = spaces.Box(low=0, high=1, shape=(self.obs_dim,), dtype=np.float32)
+        super().__init__(n, observation_space, spaces.Discrete(n_actions))
+
+    def _request(self, op, payload=b""):
+        send_frame(self.sock, op, payload)
+        reply_op, reply = recv_frame(self.sock)
+        if reply_op == ERROR:
+            error = json.loads(reply)
+            exc_type = REMOTE_ERRORS.get(error["type"], RuntimeError)
+            raise exc_type(f"env server: {error['type']}: {error['message']}")
+        return reply
+
+    def _control(self, op, indices, **request):
+        payload = json.dumps({**request, "indices": list(self._get_indices(indices))})
+        return self._request(op, payload.encode())
+
+    def _unpack_infos(self, buf, offset, count=None):
+        packed = np.frombuffer(buf, dtype=INFO_DTYPE, count=self.num_envs if count is None else count,
+                               offset=offset)
+        infos = [{name: row[name].item() for name in INFO_DTYPE.names} for row in packed]
+        return infos, offset + packed.nbytes
+
+    def reset(self):
+        seeds = [-1 if s is None else s for s in getattr(self, "_seeds", [None] * self.num_envs)]
+        reply = self._request(RESET, np.asarray(seeds, dtype="<i8").tobytes())
+        obs_size = self.num_envs * self.obs_dim * 4
+        obs = np.frombuffer(reply, dtype="<f4", count=self.num_envs * self.obs_dim).reshape(self.num_envs, -1)
+        self.reset_infos, _ = self._unpack_infos(reply, obs_size)
+        if hasattr(self, "_reset_seeds"):
+            self._reset_seeds()
+        return obs.copy()
+
+    def step_async(self, actions):
+        actions = np.asarray(actions).reshape(self.num_envs)
+        if ((actions < 0) | (actions >= self.action_space.n)).any():
+            raise ValueError(f"actions must be in [0, {self.action_space.n}), got {actions}")
+        self._actions = actions.astype(np.uint8)
+
+    def step_wait(self):
+        n, d = self.num_envs, self.obs_dim
+        reply = self._request(STEP, self._actions.tobytes())
+        offset = 0
+        obs = np.frombuffer(reply, dtype="<f4", count=n * d, offset=offset).reshape(n, d)
+        offset += n * d * 4
+        rewards = np.frombuffer(reply, dtype="<f4", count=n, offset=offset)
+        offset += n * 4
+        terminated = np.frombuffer(reply, dtype=np.uint8, count=n, offset=offset).astype(bool)
+        offset += n
+        truncated = np.frombuffer(reply, dtype=np.uint8, count=n, offset=offset).astype(bool)
+        offset += n
+        infos, offset = self._unpack_infos(reply, offset)
+
+        dones = terminated | truncated
+        finished = np.flatnonzero(dones)
+        terminal = np.frombuffer(reply, dtype="<f4", count=len(finished) * d, offset=offset).reshape(-1, d)
+        offset += terminal.nbytes
+        reset_infos, _ = self._unpack_infos(reply, offset, count=len(finished))
+        for row, i in enumerate(finished):
+            infos[i]["terminal_observation"] = terminal[row].copy()
+            infos[i]["TimeLimit.truncated"] = bool(truncated[i] and not terminated[i])
+            self.reset_infos[i] = reset_infos[row]
+        return obs.copy(), rewards.copy(), dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._request(CLOSE)
+        except (ConnectionError, OSError):
+            pass
+        self.sock.close()
+        self.closed = True
+
+    def get_attr(self, attr_name, indices=None):
+        return json.loads(self._control(ATTR, indices, name=attr_name))
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._control(SETATTR, indices, name=attr_name, value=value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        reply = self._control(METHOD, indices, name=method_name, args=method_args, kwargs=method_kwargs)
+        return json.loads(reply)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
+def bench(n_envs=16, steps=2000, address=DEFAULT_ADDRESS):
+    """Start a local server process and measure round-trip latency and throughput."""
+    import multiprocessing as mp
+
+    # spawn: a fresh interpreter instead of a fork of this one with torch already loaded.
+    # terminate() works because SDL_NO_SIGNAL_HANDLERS keeps pygame off SIGTERM (see top)
+    server = mp.get_context("spawn").Process(target=serve, args=(address,), daemon=True)
+    server.start()
+    env = RemoteVecEnv(n_envs, address)
+    try:
+        env.reset()
+        rng = np.random.default_rng(0)
+        latencies = np.empty(steps)
+        start = time.perf_counter()
+        for i in range(steps):
+            t0 = time.perf_counter()
+            env.step(rng.integers(0, env.action_space.n, size=n_envs))
+            latencies[i] = time.perf_counter() - t0
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+        server.terminate()
+        server.join(timeout=5)
+        if server.is_alive():
+            server.kill()
+            server.join()
+
+    ms = latencies * 1000
+    print(f"📡 {address} | {n_envs} envs x {steps} steps")
+    print(f"Round trip: p50 {np.percentile(ms, 50):.3f} ms | p99 {np.percentile(ms, 99):.3f} ms "
+          f"| mean {ms.mean():.3f} ms")
+    print(f"Throughput: {n_envs * steps / elapsed:,.0f} env-steps/s ({steps / elapsed:,.0f} batches/s)")
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RacingEnv server")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve")
+    serve_parser.add_argument("--address", default=DEFAULT_ADDRESS)
+    bench_parser = sub.add_parser("bench")
+    bench_parser.add_argument("--address", default=DEFAULT_ADDRESS)
+    bench_parser.add_argument("--envs", type=int, default=16)
+    bench_parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.address)
+    else:
+        bench(args.envs, args.steps, args.address)
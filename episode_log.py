@@ -0,0 +1,152 @@
+# episode_log.py
+# Episode statistics for every env in one place. A VecEnv wrapper collects finished
+# episodes from all sub-envs into an in-memory numpy buffer, which is appended in bulk
+# to a single binary file. load_episodes() maps that file back as a structured array.
+import json
+import os
+import time
+import numpy as np
+from stable_baselines3.common.vec_env import VecMonitor
+
+MAGIC = b"EPLOG1\n"
+
+EPISODE_DTYPE = np.dtype([
+    ("source", "u1"),       # 0 = train, 1 = eval (see SOURCES)
+    ("env_id", "u2"),
+    ("reward", "f4"),
+    ("length", "i4"),
+    ("laps", "i2"),
+    ("checkpoints", "i2"),
+    ("crashed", "?"),
+    ("time", "f8"),         # Unix time the episode finished (stays monotonic across resumed runs)
+])
+
+SOURCES = {"train": 0, "eval": 1}
+
+
+def _header(dtype):
+    descr = json.dumps(dtype.descr).encode()
+    return MAGIC + len(descr).to_bytes(4, "little") + descr
+
+
+class EpisodeLogger:
+    """In-memory episode buffer, flushed to `path` every `flush_every` rows."""
+
+    def __init__(self, path, flush_every=4096):
+        self.path = path
+        self.flush_every = flush_every
+        self._buf = np.zeros(flush_every, dtype=EPISODE_DTYPE)
+        self._n = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as f:
+                f.write(_header(EPISODE_DTYPE))
+        elif _read_header(path)[0] != EPISODE_DTYPE:
+            raise ValueError(f"{path} was written with a different episode record layout")
+
+    def record(self, source, env_id, reward, length, laps, checkpoints, crashed):
+        row = self._buf[self._n]
+        row["source"] = SOURCES[source]
+        row["env_id"] = env_id
+        row["reward"] = reward
+        row["length"] = length
+        row["laps"] = laps
+        row["checkpoints"] = checkpoints
+        row["crashed"] = crashed
+        row["time"] = time.time()
+        self._n += 1
+        if self._n == self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._n == 0:
+            return
+        with open(self.path, "ab") as f:
+            f.write(self._buf[:self._n].tobytes())
+        self._n = 0
+
+    def close(self):
+        self.flush()
+
+
+class VecEpisodeLogger(VecMonitor):
+    """Drop-in replacement for per-env Monitor wrappers on a VecEnv.
+
+    VecMonitor (without a CSV filename) does the episode bookkeeping and fills
+    info["episode"], so SB3's ep_rew_mean logging and evaluate_policy treat this as
+    a monitored env; finished episodes additionally go to the shared EpisodeLogger.
+    """
+
+    def __init__(self, venv, logger, source="train"):
+        super().__init__(venv)
+        self.logger = logger
+        self.source = source
+
+    def step_wait(self):
+        obs, rewards, dones, infos = super().step_wait()
+        for i in np.flatnonzero(dones):
+            info = infos[i]
+            episode = info["episode"]
+            self.logger.record(self.source, i, episode["r"], episode["l"], info.get("laps", 0),
+                               info.get("checkpoints", 0), info.get("crashed", False))
+        return obs, rewards, dones, infos
+
+    def close(self):
+        self.logger.flush()
+        return super().close()
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an episode log")
+        size = int.from_bytes(f.read(4), "little")
+        descr = json.loads(f.read(size))
+    dtype = np.dtype([tuple(field) for field in descr])
+    return dtype, len(MAGIC) + 4 + size
+
+
+def load_episodes(path, source=None):
+    """Memory-map the whole log as a structured array (fields as in EPISODE_DTYPE)."""
+    dtype, offset = _read_header(path)
+    count = (os.path.getsize(path) - offset) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    episodes = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    if source is not None:
+        episodes = episodes[episodes["source"] == SOURCES[source]]
+    return episodes
+
+
+def rolling_mean(values, window=100):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < window:
+        return values.cumsum() / np.arange(1, len(values) + 1)
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    head = csum[1:window] / np.arange(1, window)
+    return np.concatenate([head, (csum[window:] - csum[:-window]) / window])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize an episode log")
+    parser.add_argument("path", nargs="?", default="./logs/dqn_racer/episodes.bin")
+    parser.add_argument("--plot", action="store_true", help="plot rolling reward (needs matplotlib)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    episodes = load_episodes(args.path)
+    train = episodes[episodes["source"] == SOURCES["train"]]
+    print(f"📂 Loaded {len(episodes):,} episodes in {time.perf_counter() - start:.3f}s")
+    if len(train):
+        print(f"Train | mean reward: {train['reward'].mean():.2f} | mean length: {train['length'].mean():.0f} "
+              f"| crash rate: {train['crashed'].mean():.1%} | max checkpoints: {train['checkpoints'].max()}")
+
+    if args.plot:
+        import matplotlib.pyplot as plt
+        plt.plot(np.cumsum(train["length"]), rolling_mean(train["reward"]))
+        plt.xlabel("timesteps")
+        plt.ylabel("episode reward (rolling mean)")
+        plt.show()
@@ -1,55 +1,98 @@
 # evaluate_racer.py
 import numpy as np
 import time
-import pygame
-from stable_baselines3 import DQN
 from racing_env import RacingEnv
 
-env = RacingEnv()
-model = DQN.load("dqn_racer_model")
 
-# Pygame display window
-WIN = pygame.display.set_mode((800, 600))
-pygame.display.set_caption("Trained Agent Evaluation")
+def evaluate(model_path="dqn_racer_model", episodes=20, seed=None, render=True, delay=0.016,
+             record=None, verbose=True):
+    """Run a trained DQN for `episodes` episodes; optionally save the actions for `racer.py replay`."""
+    from stable_baselines3 import DQN
 
+    env = RacingEnv()
+    model = DQN.load(model_path)
+    if render:
+        import pygame  # Display only needed when watching
 
-obs, _ = env.reset()
-done = False
+    episode_actions = []
+    episode_seeds = []
+    returns = []
 
-episodes = 20
+    for ep in range(episodes):
+        ep_seed = None if seed is None else seed + ep
+        obs, info = env.reset(seed=ep_seed)
+        done = False
+        total_reward = 0
+        steps = 0
+        actions = []
 
-for ep in range(episodes):
-    obs, info = env.reset()
-    done = False
-    total_reward = 0
-    steps = 0
+        while not done:
+            if render:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        env.close()
+                        return returns
 
-    while not done:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                env.close()
-                pygame.quit()
-                exit()
+            obs = np.array(obs, dtype=np.float32)  # <- Ensure correct format
+            action, _ = model.predict(obs, deterministic=True)
+            obs, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            total_reward += reward
+            steps += 1
+            actions.append(int(action))
 
-        obs = np.array(obs, dtype=np.float32)  # <- Ensure correct format
-        action, _ = model.predict(obs, deterministic=True)
-        obs, reward, terminated,truncated, info = env.step(action)
-        done = terminated or truncated
-        total_reward += reward
-        steps += 1
+            if render:
+                env.render()
+                time.sleep(delay)  # ~60 FPS
+            if verbose:
+                print(f"[EP {ep+1}] Step: {steps}, Reward: {reward:.2f}, Checkpoint: {info.get('checkpoints', '-')}, Lap: {info.get('laps', '-')}")
+                print(f"Obs: {obs}, Action: {action}")
 
-        # Render with your car drawing and track
-        draw_surface = pygame.display.get_surface()
-        draw_surface.blit(env.surface, (0, 0))
-        env.car.draw(draw_surface)
-        pygame.display.flip()
+        returns.append(total_reward)
+        episode_actions.append(actions)
+        episode_seeds.append(-1 if ep_seed is None else ep_seed)
+        print(f"\n✅ Episode {ep+1} finished | Total Reward: {total_reward:.2f} | Steps: {steps}\n")
 
-        env.render()
-        print(f"[EP {ep+1}] Step: {steps}, Reward: {reward:.2f}, Checkpoint: {info.get('checkpoints', '-')}, Lap: {info.get('laps', '-')}")
-        print(f"Obs: {obs}, Action: {action}")
-        time.sleep(0.016)  # ~60 FPS
+    if record:
+        np.savez(record,
+                 actions=np.concatenate([np.asarray(a, dtype=np.uint8) for a in episode_actions]),
+                 lengths=np.array([len(a) for a in episode_actions]),
+                 seeds=np.array(episode_seeds),
+                 returns=np.array(returns))
+        print(f"💾 Saved {episodes} episodes to {record}")
 
-    print(f"\n✅ Episode {ep+1} finished | Total Reward: {total_reward:.2f} | Steps: {steps}\n")
+    env.close()
+    return returns
 
-env.close()
-pygame.quit()
\ No newline at end of file
+
+def replay(path, render=True, delay=0.016, episodes=None):
+    """Re-run the actions saved by evaluate(record=...) without loading the model."""
+    data = np.load(path)
+    env = RacingEnv()
+    if render:
+        import pygame
+
+    bounds = np.concatenate([[0], np.cumsum(data["lengths"])])
+    count = len(data["lengths"]) if episodes is None else min(episodes, len(data["lengths"]))
+    for ep in range(count):
+        seed = int(data["seeds"][ep])
+        env.reset(seed=None if seed < 0 else seed)
+        total_reward = 0
+        for action in data["actions"][bounds[ep]:bounds[ep + 1]]:
+            if render:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        env.close()
+                        return
+            _, reward, _, _, info = env.step(int(action))
+            total_reward += reward
+            if render:
+                env.render()
+                time.sleep(delay)
+        print(f"▶️ Episode {ep+1} replayed | Total Reward: {total_reward:.2f} "
+              f"(recorded {data['returns'][ep]:.2f}) | Checkpoint: {info['checkpoints']}")
+    env.close()
+
+
+if __name__ == "__main__":
+    evaluate()
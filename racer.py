@@ -0,0 +1,175 @@
+# racer.py
+# Single entry point for the project. Only argparse is imported up front; each
+# subcommand imports torch / stable_baselines3 / pygame when it actually runs.
+#
+#   python racer.py train --timesteps 200000 --no-resume
+#   python racer.py train --curriculum --envs 4 --subproc
+#   python racer.py train --envs 8 --env-server unix:/tmp/racing.sock
+#   python racer.py evaluate --model models/best_model --episodes 5 --record run.npz
+#   python racer.py replay run.npz
+#   python racer.py bench --startup
+#   python racer.py play
+import argparse
+import sys
+import time
+
+COMMANDS = ["train", "evaluate", "replay", "bench", "play"]
+
+
+def cmd_train(args):
+    from train_racer import train
+    if args.startup_only:
+        return
+    kwargs = dict(
+        model_dir=args.model_dir,
+        log_dir=args.log_dir,
+        total_timesteps=args.timesteps,
+        eval_freq=args.eval_freq,
+        resume=args.resume,
+        demo_dir=args.demo_dir,
+        seed=args.seed,
+        n_envs=args.envs,
+        subproc=args.subproc,
+        env_server=args.env_server,
+    )
+    if args.curriculum:
+        from curriculum import training_kwargs
+        kwargs.update(training_kwargs())  # also drops the demo warm-start
+    model, _ = train(**kwargs)
+    model.save(args.save_path)
+    print("✅ Training complete and model saved.")
+
+
+def cmd_evaluate(args):
+    from evaluate import evaluate
+    import stable_baselines3  # noqa: F401  (evaluate() imports it lazily; count it in startup)
+    if args.startup_only:
+        return
+    evaluate(args.model, args.episodes, args.seed, args.render, args.delay, args.record, args.verbose)
+
+
+def cmd_replay(args):
+    from evaluate import replay
+    if args.startup_only:
+        return
+    replay(args.path, args.render, args.delay, args.episodes)
+
+
+def cmd_play(args):
+    import car_sim
+    if args.startup_only:
+        return
+    car_sim.main()
+
+
+def cmd_bench(args):
+    import numpy as np
+    from racing_env import RacingEnv
+    from batch_sim import BatchRacingSim
+    from track_mask import footprint_offsets, footprint_on_road, points_on_road
+    if args.startup_only:
+        return
+
+    if args.startup:
+        import statistics
+        import subprocess
+
+        def cold_start(argv):
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable] + argv, check=True, stdout=subprocess.DEVNULL)
+                times.append(time.perf_counter() - start)
+            return statistics.median(times)
+
+        baseline = cold_start(["-c", "pass"])
+        print(f"⏱️ Cold start (median of {args.repeat}, python itself: {baseline * 1000:.0f} ms)")
+        for command in COMMANDS:
+            elapsed = cold_start([__file__, "--startup-only", command])
+            print(f"  {command:<9} {elapsed * 1000:7.0f} ms  (+{(elapsed - baseline) * 1000:.0f} ms imports)")
+
+    rng = np.random.default_rng(0)
+    env = RacingEnv()
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(int(rng.integers(5)))
+        if terminated or truncated:
+            env.reset()
+    env_rate = args.steps / (time.perf_counter() - start)
+    print(f"🚗 RacingEnv:      {env_rate:10,.0f} steps/s")
+
+    sim = BatchRacingSim(args.cars)
+    sim.reset()
+    start = time.perf_counter()
+    for _ in range(args.batch_steps):
+        sim.step(rng.integers(0, 5, size=args.cars))
+    sim_rate = args.batch_steps * args.cars / (time.perf_counter() - start)
+    print(f"🚀 BatchRacingSim: {sim_rate:10,.0f} steps/s ({args.cars} cars, {sim_rate / env_rate:.0f}x)")
+
+    mask = sim.mask
+    offsets = footprint_offsets()
+    for name, check in (("center", lambda: points_on_road(mask, sim.x, sim.y)),
+                        ("footprint", lambda: footprint_on_road(mask, sim.x, sim.y, sim.angle, offsets))):
+        start = time.perf_counter()
+        for _ in range(args.batch_steps):
+            check()
+        per_step = (time.perf_counter() - start) / args.batch_steps
+        print(f"💥 {name:<9} collision: {per_step * 1e6:8.1f} µs per batch of {args.cars} cars")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="racer", description="Reinforced Racers")
+    parser.add_argument("--startup-only", action="store_true", help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train = sub.add_parser("train", help="train a DQN racer")
+    train.add_argument("--timesteps", type=int, default=1_000_000)
+    train.add_argument("--eval-freq", type=int, default=5000)
+    train.add_argument("--model-dir", default="./models/")
+    train.add_argument("--log-dir", default="./logs/dqn_racer")
+    train.add_argument("--save-path", default="dqn_racer_model")
+    train.add_argument("--demo-dir", default="./demos")
+    train.add_argument("--no-resume", dest="resume", action="store_false",
+                       help="start fresh instead of continuing from <model-dir>/best_model.zip")
+    train.add_argument("--seed", type=int)
+    train.add_argument("--envs", type=int, default=1, help="parallel training envs")
+    train.add_argument("--subproc", action="store_true", help="run training envs in worker processes")
+    train.add_argument("--env-server", metavar="ADDRESS",
+                       help="step envs on a running `env_server.py serve` (unix:PATH or tcp:HOST:PORT)")
+    train.add_argument("--curriculum", action="store_true", help="schedule track variants and difficulty (curriculum.py); skips --demo-dir")
+    train.set_defaults(func=cmd_train)
+
+    evaluate = sub.add_parser("evaluate", help="run a trained model")
+    evaluate.add_argument("--model", default="dqn_racer_model")
+    evaluate.add_argument("--episodes", type=int, default=20)
+    evaluate.add_argument("--seed", type=int)
+    evaluate.add_argument("--no-render", dest="render", action="store_false")
+    evaluate.add_argument("--delay", type=float, default=0.016)
+    evaluate.add_argument("--record", help="save actions to this .npz for `replay`")
+    evaluate.add_argument("--quiet", dest="verbose", action="store_false")
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    replay = sub.add_parser("replay", help="re-run actions recorded by evaluate --record")
+    replay.add_argument("path", nargs="?", default="replay.npz")
+    replay.add_argument("--episodes", type=int)
+    replay.add_argument("--no-render", dest="render", action="store_false")
+    replay.add_argument("--delay", type=float, default=0.016)
+    replay.set_defaults(func=cmd_replay)
+
+    bench = sub.add_parser("bench", help="simulator throughput and CLI cold-start times")
+    bench.add_argument("--steps", type=int, default=2000, help="RacingEnv steps")
+    bench.add_argument("--cars", type=int, default=1024)
+    bench.add_argument("--batch-steps", type=int, default=200)
+    bench.add_argument("--startup", action="store_true", help="also time each subcommand's cold start")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.set_defaults(func=cmd_bench)
+
+    play = sub.add_parser("play", help="watch the heuristic driver in car_sim")
+    play.set_defaults(func=cmd_play)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.func(args)
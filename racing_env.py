@@ -2,38 +2,39 @@ import gymnasium as gym
 import numpy as np
 import pygame
 import math
-from car_sim import Car, draw_track
+from car_sim import Car
+from track_mask import footprint_offsets, footprint_on_road
+from tracks import CHECKPOINTS, START, VARIANTS, track_artifacts, track_surface
 
 WIDTH, HEIGHT = 800, 600
 
-checkpoints = [
-    ((440, 180), (490, 180)),
-    ((580, 125), (580, 185)),
-    ((660, 140), (660, 200)),
-    ((730, 270), (780, 270)),
-    ((760, 350), (710, 350)),
-    ((660, 420), (620, 470)),
-    ((500, 450), (500, 490)),
-    ((370, 390), (420, 430)),
-    ((340, 270), (390, 310)),
-    ((420, 150), (470, 190))
-]
+checkpoints = CHECKPOINTS
 
 class RacingEnv(gym.Env):
     metadata = {"render_modes": ["human"], "render_fps": 60}
 
-    def __init__(self):
+    def __init__(self, collision="footprint", track="default", max_speed=5, turn_speed=4,
+                 ray_length=150, max_steps=1500, stage=0):
         super().__init__()
         pygame.init()
         self.surface = pygame.Surface((WIDTH, HEIGHT))
         self.display = None  # Only used in render()
 
-        self.car = Car(425, 190)
-        self.checkpoints = checkpoints
+        self.car = Car(*START)
+
+        # "footprint": whole rotated car body vs the precomputed track mask
+        # "center": original Car.check_collision pixel test on the surface
+        if collision not in ("footprint", "center"):
+            raise ValueError(f"unknown collision mode {collision!r}")
+        self.collision = collision
+        self.footprint = footprint_offsets(self.car.width, self.car.length)
+
         self.prev_checkpoint = 0
         self.laps = 0
         self.steps = 0
-        self.max_steps = 1500
+        self._pending_stage = None
+        self._apply_stage(track=track, max_speed=max_speed, turn_speed=turn_speed,
+                          ray_length=ray_length, max_steps=max_steps, stage=stage)
 
         # Action: [0: nothing, 1: accelerate, 2: brake, 3: turn left, 4: turn right]
         self.action_space = gym.spaces.Discrete(5)
@@ -43,25 +44,59 @@ class RacingEnv(gym.Env):
             low=0, high=1, shape=(10,), dtype=np.float32
         )
 
+    def set_stage(self, **stage):
+        """Queue a curriculum stage (stage, track, max_speed, turn_speed, ray_length, max_steps) for the next reset.
+
+        `stage` is the curriculum's stage index; it is reported in info["stage"] for every
+        episode played with these settings.
+        """
+        unknown = set(stage) - {"stage", "track", "max_speed", "turn_speed", "ray_length", "max_steps"}
+        if unknown:
+            raise ValueError(f"unknown stage parameters {sorted(unknown)}")
+        if stage.get("track", "default") not in VARIANTS:
+            raise ValueError(f"unknown track {stage['track']!r}")
+        self._pending_stage = stage
+
+    def _apply_stage(self, track=None, max_speed=None, turn_speed=None, ray_length=None, max_steps=None,
+                     stage=None):
+        if stage is not None:
+            self.stage = stage
+        if track is not None:
+            # Cached artifacts: switching tracks is a lookup and a blit, not a redraw
+            variant = VARIANTS[track]
+            self.track = track
+            self.track_mask = track_artifacts(track)["mask"]
+            self.checkpoints = variant.checkpoints
+            self.car.init_x, self.car.init_y, self.car.init_angle = variant.start
+            self.surface.blit(track_surface(track), (0, 0))
+        if max_speed is not None:
+            self.car.max_speed = max_speed
+        if turn_speed is not None:
+            self.car.turn_speed = turn_speed
+        if ray_length is not None:
+            self.ray_length = ray_length
+        if max_steps is not None:
+            self.max_steps = max_steps
+
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed)
         if seed is not None:
             self.np_random = np.random.default_rng(seed)
+        if self._pending_stage is not None:
+            self._apply_stage(**self._pending_stage)
+            self._pending_stage = None
 
         self.car.reset()
         self.prev_checkpoint = 0
         self.laps = 0
         self.steps = 0
 
-        draw_track(self.surface)
-        self.car.cast_rays(self.surface)
-
         obs = self._get_state()
         return obs, self._get_info()
 
     def _get_state(self):
-        self.car.cast_rays(self.surface)
-        sensors = [min(d / 150, 1.0) for d in self.car.sensor_distances]
+        self.car.cast_rays(self.surface, ray_length=self.ray_length)
+        sensors = [min(d / self.ray_length, 1.0) for d in self.car.sensor_distances]
         speed = self.car.speed / self.car.max_speed
         return np.array(sensors + [speed], dtype=np.float32)
 
@@ -71,7 +106,8 @@ class RacingEnv(gym.Env):
             "laps": self.laps,
             "steps": self.steps,
             "speed": self.car.speed,
-            "crashed": self.car.crashed
+            "crashed": self.car.crashed,
+            "stage": self.stage
         }
 
     def step(self, action):
@@ -97,8 +133,14 @@ class RacingEnv(gym.Env):
         self.car.x += self.car.speed * math.cos(rad)
         self.car.y += self.car.speed * math.sin(rad)
 
-        draw_track(self.surface)
-        self.car.check_collision(self.surface)
+        # self.surface only ever holds the track, blitted in _apply_stage, so no redraw here
+        laps_before = self.car.laps
+        if self.collision == "footprint":
+            if not footprint_on_road(self.track_mask, [self.car.x], [self.car.y],
+                                     [self.car.angle], self.footprint)[0]:
+                self.car.crashed = True
+        else:
+            self.car.check_collision(self.surface)
         self.car.check_checkpoint(self.checkpoints)
 
         reward = -0.01  # Small time penalty
@@ -107,8 +149,8 @@ class RacingEnv(gym.Env):
             reward += 1.0
             self.prev_checkpoint = self.car.checkpoint_index
 
-        # Completed a full lap
-        if self.car.checkpoint_index == 0 and self.prev_checkpoint == len(self.checkpoints):
+        # Completed a full lap (Car.check_checkpoint wraps checkpoint_index back to 0 itself)
+        if self.car.laps > laps_before:
             reward += 20.0
             self.prev_checkpoint = 0
             self.laps += 1
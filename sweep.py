@@ -0,0 +1,208 @@
+# sweep.py
+# Grid / random search over the DQN hyperparameters in train_racer.DEFAULT_CONFIG.
+# Trials run in a process pool, each pinned to its own CPU core with its own
+# model/log directory, and a trial is stopped early when its EvalCallback score
+# falls below the median of the other trials at the same timestep.
+#
+#   python sweep.py sweep_spec.json
+#
+# Spec example:
+#   {
+#     "name": "lr_tau",
+#     "method": "random",            # or "grid"
+#     "num_trials": 16,              # random only
+#     "total_timesteps": 200000,
+#     "eval_freq": 5000,
+#     "params": {
+#       "learning_rate": {"low": 1e-4, "high": 3e-3, "log": true},
+#       "tau": [0.01, 0.1, 1.0],
+#       "target_update_interval": {"low": 500, "high": 5000, "int": true}
+#     }
+#   }
+# Grid search expands every list in "params" (ranges are not allowed there).
+import argparse
+import csv
+import itertools
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+
+DEFAULT_SPEC = {
+    "name": "sweep",
+    "method": "grid",
+    "num_trials": 8,
+    "total_timesteps": 200_000,
+    "eval_freq": 5000,
+    "seed": 0,
+    "workers": None,        # defaults to one per available core
+    "grace_evals": 3,       # evaluations before a trial can be pruned
+    "min_peers": 2,         # other trials needed at a timestep to compare against
+    "params": {},
+}
+
+
+def _sample(rng, choice):
+    if isinstance(choice, list):
+        return choice[rng.integers(len(choice))]
+    low, high = choice["low"], choice["high"]
+    if choice.get("log"):
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    return int(round(value)) if choice.get("int") else float(value)
+
+
+def expand_trials(spec):
+    """Turn a sweep spec into a list of config dicts."""
+    params = spec["params"]
+    if spec["method"] == "grid":
+        for name, choice in params.items():
+            if not isinstance(choice, list):
+                raise ValueError(f"grid search needs a list of values for {name!r}")
+        names = list(params)
+        return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+    if spec["method"] == "random":
+        rng = np.random.default_rng(spec["seed"])
+        return [{name: _sample(rng, choice) for name, choice in params.items()}
+                for _ in range(spec["num_trials"])]
+    raise ValueError(f"unknown sweep method {spec['method']!r}")
+
+
+def _pin_worker(cpu_queue):
+    cpu = cpu_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    # One core per trial, so keep torch from spawning a thread per core
+    import torch
+    torch.set_num_threads(1)
+
+
+def _run_trial(args):
+    trial_id, config, spec, sweep_dir, scores, lock = args
+    from stable_baselines3.common.callbacks import BaseCallback
+    from train_racer import train
+
+    class MedianStopping(BaseCallback):
+        """callback_after_eval: stop when below the median of peers at this timestep."""
+
+        def __init__(self):
+            super().__init__()
+            self.evals = 0
+            self.pruned = False
+
+        def _on_step(self):
+            self.evals += 1
+            step = self.num_timesteps
+            score = float(self.parent.last_mean_reward)
+            with lock:
+                peers = [s for t, s in scores.get(step, {}).items() if t != trial_id]
+                scores[step] = {**scores.get(step, {}), trial_id: score}
+            if self.evals >= spec["grace_evals"] and len(peers) >= spec["min_peers"]:
+                if score < float(np.median(peers)):
+                    self.pruned = True
+                    return False
+            return True
+
+    trial_dir = os.path.join(sweep_dir, f"trial_{trial_id:03d}")
+    os.makedirs(trial_dir, exist_ok=True)
+    stopper = MedianStopping()
+    result = {"trial": trial_id, "status": "done", "best_reward": float("-inf"),
+              "timesteps": 0, "seconds": 0.0, **config}
+    start = time.perf_counter()
+    try:
+        model, eval_callback = train(
+            config,
+            model_dir=os.path.join(trial_dir, "models"),
+            log_dir=os.path.join(trial_dir, "logs"),
+            total_timesteps=spec["total_timesteps"],
+            eval_freq=spec["eval_freq"],
+            resume=False,
+            demo_dir=spec.get("demo_dir"),
+            callback_after_eval=stopper,
+            seed=spec["seed"] + trial_id,
+            verbose=0,
+        )
+        result["best_reward"] = float(eval_callback.best_mean_reward)
+        result["timesteps"] = int(model.num_timesteps)
+        if stopper.pruned:
+            result["status"] = "pruned"
+    except Exception as exc:
+        result["status"] = f"failed: {type(exc).__name__}: {exc}"
+    result["seconds"] = round(time.perf_counter() - start, 1)
+
+    with open(os.path.join(trial_dir, "result.json"), "w") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def run_sweep(spec, out_dir="./sweeps"):
+    """Run every trial of `spec` and return the results ranked by best eval reward."""
+    spec = {**DEFAULT_SPEC, **spec}
+    trials = expand_trials(spec)
+    sweep_dir = os.path.join(out_dir, spec["name"])
+    os.makedirs(sweep_dir, exist_ok=True)
+    with open(os.path.join(sweep_dir, "spec.json"), "w") as f:
+        json.dump(spec, f, indent=2)
+
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+    workers = min(spec["workers"] or len(cpus), len(cpus), len(trials))
+    print(f"🧪 {len(trials)} trials on {workers} workers -> {sweep_dir}")
+
+    ctx = mp.get_context("spawn")  # pygame and torch don't survive fork well
+    with ctx.Manager() as manager:
+        cpu_queue = manager.Queue()
+        for cpu in cpus[:workers]:
+            cpu_queue.put(cpu)
+        scores = manager.dict()
+        lock = manager.Lock()
+        jobs = [(i, config, spec, sweep_dir, scores, lock) for i, config in enumerate(trials)]
+
+        results = []
+        with ctx.Pool(workers, initializer=_pin_worker, initargs=(cpu_queue,)) as pool:
+            for result in pool.imap_unordered(_run_trial, jobs):
+                print(f"[trial {result['trial']}] {result['status']} | best reward: "
+                      f"{result['best_reward']:.2f} | {result['timesteps']:,} steps in {result['seconds']}s")
+                results.append(result)
+
+    results.sort(key=lambda r: r["best_reward"], reverse=True)
+    write_summary(results, list(spec["params"]), sweep_dir)
+    return results
+
+
+def write_summary(results, param_names, sweep_dir):
+    columns = ["rank", "trial", "status", "best_reward", "timesteps", "seconds"] + param_names
+    rows = [{"rank": rank, **r} for rank, r in enumerate(results, 1)]
+
+    with open(os.path.join(sweep_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    def fmt(value):
+        if isinstance(value, float):
+            return f"{value:.4g}"
+        return str(value)
+
+    table = [[fmt(row.get(c, "")) for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(t[i]) for t in table]) for i, c in enumerate(columns)]
+    print("\n🏆 Sweep results")
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for line in table:
+        print("  ".join(v.ljust(w) for v, w in zip(line, widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel DQN hyperparameter sweep")
+    parser.add_argument("spec", help="JSON sweep spec")
+    parser.add_argument("--out", default="./sweeps")
+    parser.add_argument("--workers", type=int, help="override the spec's worker count")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    if args.workers:
+        spec["workers"] = args.workers
+    run_sweep(spec, args.out)
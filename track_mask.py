@@ -0,0 +1,59 @@
+# track_mask.py
+# Precomputed road mask for the track and the oriented car-footprint collision test.
+# Car.check_collision only looks at the pixel under the car's center on whatever was
+# drawn last; here the rotated width x length rectangle is sampled at its corners and
+# along its edges and tested against the mask with one fancy-index per step, for any
+# number of cars.
+import numpy as np
+import pygame
+from car_sim import GRAY, WHITE, WIDTH, HEIGHT, draw_track
+
+CAR_WIDTH, CAR_LENGTH = 15, 30  # Car.width / Car.length
+
+
+def build_track_mask(draw_fn=draw_track, width=WIDTH, height=HEIGHT):
+    """Render the track off-screen and return a (height, width) bool array, True on road."""
+    surface = pygame.Surface((width, height))
+    draw_fn(surface)
+    rgb = pygame.surfarray.array3d(surface).transpose(1, 0, 2)  # (W, H, 3) -> (H, W, 3)
+    road = np.zeros((height, width), dtype=bool)
+    for color in (GRAY, WHITE):
+        road |= np.all(rgb == np.array(color, dtype=rgb.dtype), axis=2)
+    return road
+
+
+def footprint_offsets(width=CAR_WIDTH, length=CAR_LENGTH, spacing=5.0):
+    """(K, 2) sample points on the car's outline as (forward, left) offsets from its center."""
+    half_l, half_w = length / 2, width / 2
+    along = np.linspace(-half_l, half_l, max(2, int(np.ceil(length / spacing)) + 1))
+    across = np.linspace(-half_w, half_w, max(2, int(np.ceil(width / spacing)) + 1))
+    points = np.concatenate([
+        np.stack([along, np.full_like(along, -half_w)], axis=1),
+        np.stack([along, np.full_like(along, half_w)], axis=1),
+        np.stack([np.full_like(across[1:-1], -half_l), across[1:-1]], axis=1),
+        np.stack([np.full_like(across[1:-1], half_l), across[1:-1]], axis=1),
+    ])
+    return points
+
+
+def points_on_road(mask, px, py):
+    """Mask lookup for integer-truncated points; anything off-screen is off the road."""
+    height, width = mask.shape
+    xi = px.astype(np.int64)
+    yi = py.astype(np.int64)
+    inside = (xi >= 0) & (xi < width) & (yi >= 0) & (yi < height)
+    flat = np.clip(yi, 0, height - 1) * width + np.clip(xi, 0, width - 1)
+    return inside & mask.ravel().take(flat)
+
+
+def footprint_on_road(mask, x, y, angle, offsets):
+    """True for every car whose whole rotated footprint is on the road.
+
+    x, y, angle are (N,) arrays in Car's conventions (degrees, heading = radians(-angle)).
+    """
+    rad = np.radians(-np.asarray(angle, dtype=np.float64))[:, None]
+    cos, sin = np.cos(rad), np.sin(rad)
+    forward, left = offsets[:, 0], offsets[:, 1]
+    px = np.asarray(x, dtype=np.float64)[:, None] + forward * cos + left * sin
+    py = np.asarray(y, dtype=np.float64)[:, None] + forward * sin - left * cos
+    return points_on_road(mask, px, py).all(axis=1)
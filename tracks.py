@@ -0,0 +1,113 @@
+# tracks.py
+# Track variants for curriculum training. Every variant is the base layout from car_sim
+# under a mirror transform, so road width and corner radii are unchanged but the turns
+# come in a different order and handedness.
+#
+# A variant's precomputed artifacts (rendered RGB track and road mask) are built once,
+# saved as .npy under CACHE_DIR and memory-mapped on load, so every worker process shares
+# the same pages and switching a curriculum stage never redraws or re-rasterizes a track.
+# Cache files are keyed on a hash of the variant geometry and the drawing code, so editing
+# the outline, draw_track or the colours builds fresh artifacts instead of loading stale ones.
+import hashlib
+import inspect
+import os
+from functools import lru_cache
+import numpy as np
+import pygame
+import car_sim
+from car_sim import INNER, OUTER, WIDTH, HEIGHT, draw_track
+from track_mask import build_track_mask
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".track_cache")
+
+# Checkpoints in driving order: one gate per pair of matching outline vertices, so every
+# gate spans the full road width. The start line (OUTER[0]-INNER[0]) is the finish gate;
+# the car starts just behind it, so crossing it on the way out doesn't count.
+CHECKPOINTS = [(OUTER[k], INNER[k]) for k in range(1, len(OUTER))] + [(OUTER[0], INNER[0])]
+START = (425, 190, -10)  # x, y, angle
+
+
+class TrackVariant:
+    def __init__(self, name, flip_x=False, flip_y=False):
+        self.name = name
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+
+    def point(self, p):
+        x, y = p
+        return (WIDTH - x if self.flip_x else x, HEIGHT - y if self.flip_y else y)
+
+    @property
+    def outer(self):
+        return [self.point(p) for p in OUTER]
+
+    @property
+    def inner(self):
+        return [self.point(p) for p in INNER]
+
+    @property
+    def checkpoints(self):
+        return [(self.point(a), self.point(b)) for a, b in CHECKPOINTS]
+
+    @property
+    def start(self):
+        x, y = self.point(START[:2])
+        angle = START[2]
+        # Heading is (cos(-angle), sin(-angle)); mirror it with the track
+        if self.flip_x:
+            angle = 180 - angle
+        if self.flip_y:
+            angle = -angle
+        return x, y, angle
+
+    def draw(self, surface):
+        draw_track(surface, self.outer, self.inner)
+
+
+VARIANTS = {v.name: v for v in [
+    TrackVariant("default"),
+    TrackVariant("mirror_x", flip_x=True),
+    TrackVariant("mirror_y", flip_y=True),
+    TrackVariant("rotate_180", flip_x=True, flip_y=True),
+]}
+
+
+def artifact_key(variant):
+    """Short hash of everything that affects a variant's rendered track and mask."""
+    parts = [
+        variant.outer, variant.inner, (WIDTH, HEIGHT),
+        (car_sim.GREEN, car_sim.GRAY, car_sim.WHITE),
+        inspect.getsource(draw_track), inspect.getsource(build_track_mask),
+    ]
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+
+
+def _build_artifacts(variant):
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    variant.draw(surface)
+    rgb = pygame.surfarray.array3d(surface).transpose(1, 0, 2).copy()  # (H, W, 3)
+    return {"rgb": rgb, "mask": build_track_mask(variant.draw)}
+
+
+@lru_cache(maxsize=None)
+def track_artifacts(name, cache_dir=CACHE_DIR):
+    """{'rgb': (H, W, 3) uint8, 'mask': (H, W) bool} for a variant, read-only and mmapped."""
+    variant = VARIANTS[name]
+    digest = artifact_key(variant)
+    paths = {key: os.path.join(cache_dir, f"{name}_{digest}_{key}.npy") for key in ("rgb", "mask")}
+    if not all(os.path.exists(p) for p in paths.values()):
+        os.makedirs(cache_dir, exist_ok=True)
+        for key, array in _build_artifacts(variant).items():
+            # Write then rename, so a worker never maps a half-written file
+            tmp = f"{paths[key]}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, paths[key])
+    return {key: np.load(path, mmap_mode="r") for key, path in paths.items()}
+
+
+@lru_cache(maxsize=None)
+def track_surface(name):
+    """pygame Surface of a variant, shared by every env in this process (blit source only)."""
+    rgb = track_artifacts(name)["rgb"]
+    return pygame.surfarray.make_surface(np.ascontiguousarray(rgb.transpose(1, 0, 2)))
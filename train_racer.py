@@ -1,61 +1,107 @@
 # train_racer.py
 from stable_baselines3 import DQN
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.callbacks import EvalCallback
-from racing_env import RacingEnv
+from stable_baselines3.common.callbacks import CallbackList, EvalCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from episode_log import EpisodeLogger, VecEpisodeLogger
 import os
 
-# Setup logging and model directories
-log_dir = "./logs/dqn_racer"
-model_dir = "./models/"
-os.makedirs(log_dir, exist_ok=True)
-os.makedirs(model_dir, exist_ok=True)
-
-# Create training environment
-env = RacingEnv()
-env = Monitor(env, log_dir)
-
-# Create separate evaluation environment
-eval_env = Monitor(RacingEnv(), log_dir)
-
-# Evaluation callback to save best model
-eval_callback = EvalCallback(
-    eval_env,
-    best_model_save_path=model_dir,
-    log_path=log_dir,
-    eval_freq=5000,
-    deterministic=True,
-    render=False
-)
-
-# Load model if it exists
-model_path = os.path.join(model_dir, "best_model.zip")
-if os.path.exists(model_path):
-    print("🔁 Continuing training from saved model...")
-    model = DQN.load(model_path, env=env, tensorboard_log=log_dir)
-    model.set_env(env)  # Reset env
-else:
-    print("🆕 Training new model...")
-    model = DQN(
-        "MlpPolicy",
-        env,
-        learning_rate=1e-3,
-        buffer_size=100_000,
-        learning_starts=1000,
-        batch_size=64,
-        exploration_fraction=0.3,
-        exploration_final_eps=0.05,
-        tau=0.1,
-        gamma=0.99,
-        train_freq=1,
-        target_update_interval=1000,
-        verbose=1,
-        tensorboard_log=log_dir
+# DQN hyperparameters; sweep.py overrides any subset of these per trial
+DEFAULT_CONFIG = {
+    "learning_rate": 1e-3,
+    "buffer_size": 100_000,
+    "learning_starts": 1000,
+    "batch_size": 64,
+    "exploration_fraction": 0.3,
+    "exploration_final_eps": 0.05,
+    "tau": 0.1,
+    "gamma": 0.99,
+    "train_freq": 1,
+    "target_update_interval": 1000,
+}
+
+
+def train(config=None, model_dir="./models/", log_dir="./logs/dqn_racer", total_timesteps=1_000_000,
+          eval_freq=5000, resume=True, demo_dir="./demos", callback_after_eval=None, seed=None, verbose=1,
+          env_fn=None, n_envs=1, subproc=False, callbacks=(), env_server=None):
+    """Train a DQN racer and return (model, eval_callback).
+
+    env_fn builds each training env (n_envs of them, in worker processes if subproc;
+    default RacingEnv); evaluation always runs on a default RacingEnv so scores stay
+    comparable. With env_server (an env_server.py address) both run on that server
+    instead, and env_fn/subproc are ignored.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+
+    # Setup logging and model directories
+    os.makedirs(log_dir, exist_ok=True)
+    os.makedirs(model_dir, exist_ok=True)
+
+    # Train and eval episodes share one buffered log (read it with episode_log.load_episodes)
+    episode_logger = EpisodeLogger(os.path.join(log_dir, "episodes.bin"))
+
+    if env_server:
+        # The RacingEnvs (pygame, track surface) live in the server process
+        from env_server import RemoteVecEnv
+        train_venv = RemoteVecEnv(n_envs, env_server)
+        eval_venv = RemoteVecEnv(1, env_server)
+    else:
+        from racing_env import RacingEnv
+        vec_env_cls = SubprocVecEnv if subproc else DummyVecEnv
+        train_venv = vec_env_cls([env_fn or RacingEnv] * n_envs)
+        eval_venv = DummyVecEnv([RacingEnv])
+
+    # Create training environment
+    env = VecEpisodeLogger(train_venv, episode_logger, source="train")
+
+    # Create separate evaluation environment
+    eval_env = VecEpisodeLogger(eval_venv, episode_logger, source="eval")
+
+    # Evaluation callback to save best model
+    eval_callback = EvalCallback(
+        eval_env,
+        best_model_save_path=model_dir,
+        log_path=log_dir,
+        eval_freq=eval_freq,
+        deterministic=True,
+        render=False,
+        callback_after_eval=callback_after_eval,
+        verbose=verbose
     )
 
-# Start training
-model.learn(total_timesteps=1_000_000, callback=eval_callback)
+    # Load model if it exists
+    model_path = os.path.join(model_dir, "best_model.zip")
+    if resume and os.path.exists(model_path):
+        print("🔁 Continuing training from saved model...")
+        model = DQN.load(model_path, env=env, tensorboard_log=log_dir)
+        model.set_env(env)  # Reset env
+    else:
+        print("🆕 Training new model...")
+        model = DQN(
+            "MlpPolicy",
+            env,
+            verbose=verbose,
+            tensorboard_log=log_dir,
+            seed=seed,
+            **config
+        )
+
+    # Warm-start the replay buffer with heuristic demonstrations (python demo_driver.py)
+    if demo_dir and os.path.isdir(demo_dir):
+        from demo_driver import fill_replay_buffer
+        added = fill_replay_buffer(model, demo_dir, max_transitions=model.buffer_size)
+        print(f"📼 Loaded {added:,} demonstration transitions into the replay buffer")
+
+    # Start training
+    try:
+        model.learn(total_timesteps=total_timesteps, callback=CallbackList([eval_callback, *callbacks]))
+    finally:
+        episode_logger.close()
+    return model, eval_callback
+
+
+if __name__ == "__main__":
+    model, _ = train()
 
-# Save final model
-model.save("dqn_racer_model")
-print("✅ Training complete and model saved.")
+    # Save final model
+    model.save("dqn_racer_model")
+    print("✅ Training complete and model saved.")